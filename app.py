@@ -1,12 +1,28 @@
 import streamlit as st
 import os
 import json
-import yaml
-import re
-import shutil
-import tempfile
+import io
+import zipfile
+import bisect
+import functools
+from collections import deque
 from pathlib import Path
 
+# Tree-drawing characters stripped from ASCII lines in a single pass
+_TREE_TRANS = str.maketrans('', '', '├└│─┌┐┘┬┴┼')
+
+# Leading characters counted as indentation, and the branch glyphs that
+# start an entry (everything after a branch up to the name is indentation too)
+_INDENT_CHARS = ' \t│'
+_BRANCH_CHARS = '├└┌┐┘┬┴┼─'
+_BRANCH_FILL_CHARS = ' ─'
+
+# Path separator used to join validated names in the creation walk
+_SEP = os.sep
+
+# Characters not allowed in file/folder names
+_INVALID_CHARS = frozenset('<>:"|?*')
+
 # Page config
 st.set_page_config(
     page_title="AutoStruct - Project Structure Generator",
@@ -23,123 +39,347 @@ st.markdown("Create project structures instantly from ASCII, JSON, or YAML input
 # -----------------------------
 # Parsing Functions
 # -----------------------------
-def parse_ascii(text):
-    """Parse ASCII tree format into dictionary structure"""
-    lines = text.strip().split('\n')
-    result = {}
-    stack = [(result, -1)]
-    
+def parse_ascii(lines):
+    """Parse ASCII tree format (any iterable of lines) into dictionary structure"""
+    # Pass 1: flatten lines into (indent, name, is_folder) records
+    records = []
     for line in lines:
         if not line.strip():
             continue
         
-        indent = 0
-        content_start = 0
-        for i, char in enumerate(line):
-            if char in ' \t│':
-                indent += 1
-            elif char in '├└┌┐┘┬┴┼─':
-                content_start = i + 1
-                while content_start < len(line) and line[content_start] in ' ─':
-                    content_start += 1
-                    indent += 1
-                break
-            else:
-                content_start = i
-                break
+        content = line.lstrip(_INDENT_CHARS)
+        indent = len(line) - len(content)
+        if content and content[0] in _BRANCH_CHARS:
+            branch = content[1:]
+            content = branch.lstrip(_BRANCH_FILL_CHARS)
+            indent += len(branch) - len(content)
         
-        cleaned = line[content_start:].strip() if content_start < len(line) else line.strip()
-        cleaned = re.sub(r'^[├└│─┌┐┘┬┴┼\s]*', '', cleaned)
-        cleaned = re.sub(r'[├└│─┌┐┘┬┴┼]+\s*', '', cleaned).strip()
-        cleaned = re.sub(r'^[\s─]+', '', cleaned)
-        cleaned = re.sub(r'[\s─]+$', '', cleaned)
+        cleaned = content.translate(_TREE_TRANS).strip()
         
         if not cleaned:
             continue
         
-        while len(stack) > 1 and stack[-1][1] >= indent:
-            stack.pop()
-        
-        current_dict = stack[-1][0]
-        
         if cleaned.endswith('/'):
-            folder_name = cleaned[:-1]
-            if folder_name:
-                current_dict[folder_name] = {}
-                stack.append((current_dict[folder_name], indent))
+            records.append((indent, cleaned[:-1], True))
+        else:
+            records.append((indent, cleaned, False))
+    
+    # Pass 2: build the tree, adding runs of sibling files in one call.
+    # Open folders and their indents are kept in parallel lists; indents
+    # strictly increase, so the folders to close are found by bisection
+    result = {}
+    dict_stack = [result]
+    indent_stack = [-1]
+    files = []
+    
+    for indent, name, is_folder in records:
+        cut = bisect.bisect_left(indent_stack, indent)
+        if cut < len(indent_stack):
+            if files:
+                dict_stack[-1].update(dict.fromkeys(files))
+                files = []
+            del dict_stack[cut:]
+            del indent_stack[cut:]
+        
+        if is_folder:
+            if files:
+                dict_stack[-1].update(dict.fromkeys(files))
+                files = []
+            if name:
+                folder = dict_stack[-1][name] = {}
+                dict_stack.append(folder)
+                indent_stack.append(indent)
         else:
-            current_dict[cleaned] = None
+            files.append(name)
+    
+    if files:
+        dict_stack[-1].update(dict.fromkeys(files))
     return result
 
+def _structure_mapping(mapping):
+    """Mark entries that are neither folders (dict) nor files (None) as False
+    so they are still validated but never created"""
+    return {k: (v if v is None or isinstance(v, dict) else False) for k, v in mapping.items()}
+
 def parse_json(text):
     try:
-        return json.loads(text)
+        return json.loads(text, object_hook=_structure_mapping)
     except json.JSONDecodeError as e:
         st.error(f"Invalid JSON format: {e}")
         return None
 
+@functools.lru_cache(maxsize=None)
+def _structure_loader(yaml):
+    """Build the normalizing SafeLoader once per yaml module"""
+    class StructureLoader(yaml.SafeLoader):
+        """SafeLoader that normalizes mappings while loading"""
+        def construct_mapping(self, node, deep=False):
+            return _structure_mapping(super().construct_mapping(node, deep=deep))
+
+    return StructureLoader
+
 def parse_yaml(text):
+    # Imported lazily so ASCII/JSON-only sessions never load PyYAML
+    import yaml
     try:
-        return yaml.safe_load(text)
+        return yaml.load(text, Loader=_structure_loader(yaml))
     except yaml.YAMLError as e:
         st.error(f"Invalid YAML format: {e}")
         return None
 
+@st.cache_data(max_entries=32, show_spinner=False)
+def _parse(format_type, text):
+    """Parse and validate text in the given format; returns (structure, issues).
+    Cached on the raw text, which is cheap to hash, so unchanged input skips
+    both steps on rerun"""
+    structure = None
+    if format_type == "ASCII":
+        structure = parse_ascii(text.splitlines())
+    elif format_type == "JSON":
+        structure = parse_json(text)
+    elif format_type == "YAML":
+        structure = parse_yaml(text)
+    issues = validate_structure(structure) if structure else []
+    return structure, issues
+
 # -----------------------------
 # Validation & Creation
 # -----------------------------
 def validate_structure(structure):
     issues = []
-    def validate_recursive(obj, current_path=""):
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                if re.search(r'[<>:"|?*]', key):
-                    issues.append(f"Invalid characters in name: {current_path}/{key}")
+    if not isinstance(structure, dict):
+        return issues
+    # Depth-first walk over (path, items iterator) pairs, in the same order
+    # a recursive walk would visit them. YAML aliases can make a mapping
+    # contain itself, so the ids of the dicts on the stack are tracked
+    stack = deque([("", iter(structure.items()), id(structure))])
+    open_ids = {id(structure)}
+    while stack:
+        current_path, items, _ = stack[-1]
+        for key, value in items:
+            if not _INVALID_CHARS.isdisjoint(key):
+                issues.append(f"Invalid characters in name: {current_path}/{key}")
+            if key.startswith(('/', '\\')) or '..' in key.replace('\\', '/').split('/'):
+                issues.append(f"Name points outside its folder: {current_path}/{key}")
+            if isinstance(value, dict):
                 new_path = f"{current_path}/{key}" if current_path else key
-                if isinstance(value, dict):
-                    validate_recursive(value, new_path)
-    validate_recursive(structure)
+                if id(value) in open_ids:
+                    issues.append(f"Recursive structure at: {new_path}")
+                    continue
+                stack.append((new_path, iter(value.items()), id(value)))
+                open_ids.add(id(value))
+                break
+        else:
+            open_ids.discard(stack.pop()[2])
     return issues
 
-def create_structure(structure, base_path, dry_run=False):
-    logs = []
-    def create_recursive(obj, current_path):
-        if not isinstance(obj, dict):
-            return
-        for key, value in obj.items():
-            full_path = os.path.join(current_path, key)
-            try:
-                if value is None:
-                    if not dry_run:
-                        os.makedirs(os.path.dirname(full_path), exist_ok=True)
-                        with open(full_path, 'w') as f:
-                            pass
-                    logs.append(f"✅ {'[DRY RUN] ' if dry_run else ''}Created file: {full_path}")
-                elif isinstance(value, dict):
-                    if not dry_run:
-                        os.makedirs(full_path, exist_ok=True)
-                    logs.append(f"📁 {'[DRY RUN] ' if dry_run else ''}Created folder: {full_path}")
-                    create_recursive(value, full_path)
-            except Exception as e:
-                logs.append(f"❌ Error creating {full_path}: {str(e)}")
-    if isinstance(structure, dict):
-        create_recursive(structure, base_path)
-    return logs
+def _collect_entries(structure, base):
+    """Walk the structure into ordered (path, is_folder, rel, error) entries
+    plus the directories _create_real has to make.
+
+    Every directory is made before any file, so the order in which entries
+    claim their paths is replayed here: the first entry to claim a path as a
+    file or a folder wins, as it did when entries were created one by one"""
+    entries = []
+    # Paths relative to base -> True for a folder, False for a file
+    claimed = {os.curdir: True}
+    if not isinstance(structure, dict):
+        return entries, []
+    rel_start = len(base) + 1
+
+    def settle(rel, kind):
+        """On a clash, a path that already exists on disk keeps its own kind,
+        since the earlier entry's create will fail there instead"""
+        path = f"{base}{_SEP}{rel}"
+        if os.path.isdir(path):
+            kind = True
+        elif os.path.lexists(path):
+            kind = False
+        claimed[rel] = kind
+        return kind
+
+    def claim_dirs(rel):
+        """Claim rel and its ancestors as folders; returns a conflict or None"""
+        missing = []
+        prefix = None
+        for part in rel.split(_SEP):
+            prefix = part if prefix is None else f"{prefix}{_SEP}{part}"
+            kind = claimed.get(prefix)
+            if kind is False and settle(prefix, False) is False:
+                return f"conflicts with earlier file {base}{_SEP}{prefix}"
+            if kind is None:
+                missing.append(prefix)
+        for prefix in missing:
+            claimed[prefix] = True
+        return None
+
+    # Self-containing mappings are reported by validate_structure; here they
+    # are just not descended into again
+    stack = deque([(base, os.curdir, iter(structure.items()), id(structure))])
+    open_ids = {id(structure)}
+    while stack:
+        current_path, current_rel, items, _ = stack[-1]
+        for key, value in items:
+            if value is False:
+                continue
+            # Joined directly rather than through os.path.join; names may still
+            # hold separators, so those are normalized and checked against base
+            full_path = f"{current_path}{_SEP}{key}"
+            plain = not (_SEP in key or '/' in key or key in ('', os.curdir, os.pardir))
+            if plain:
+                rel = key if current_rel == os.curdir else f"{current_rel}{_SEP}{key}"
+            else:
+                rel = _relative_name(full_path, rel_start)
+
+            error = None
+            if rel is None:
+                error = "path escapes the base directory"
+            elif value is None:
+                # A plain name's folder was claimed when the walk entered it
+                if not plain and os.path.dirname(rel):
+                    error = claim_dirs(os.path.dirname(rel))
+                if error is None:
+                    if claimed.get(rel) is True and settle(rel, True) is True:
+                        error = f"conflicts with earlier folder {base}{_SEP}{rel}"
+                    else:
+                        claimed[rel] = False
+            elif plain:
+                if claimed.get(rel) is False and settle(rel, False) is False:
+                    error = f"conflicts with earlier file {base}{_SEP}{rel}"
+                else:
+                    claimed.setdefault(rel, True)
+            else:
+                error = claim_dirs(rel)
+            entries.append((full_path, value is not None, rel, error))
+
+            # A folder that can't be claimed is not descended into
+            if value is not None and error is None and id(value) not in open_ids:
+                stack.append((full_path, rel, iter(value.items()), id(value)))
+                open_ids.add(id(value))
+                break
+        else:
+            open_ids.discard(stack.pop()[3])
+    # Claims were made parents first, so this order is safe for plain mkdir
+    dirs = [rel for rel, is_folder in claimed.items() if is_folder and rel != os.curdir]
+    return entries, dirs
+
+def _dry_run(structure, base):
+    """Report what would be created; a pure string-building walk with none of
+    the bookkeeping _create_real needs"""
+    files_ok = []
+    dirs_ok = []
+    if not isinstance(structure, dict):
+        return files_ok, dirs_ok, []
+    stack = deque([(base, iter(structure.items()), id(structure))])
+    open_ids = {id(structure)}
+    while stack:
+        current_path, items, _ = stack[-1]
+        for key, value in items:
+            full_path = f"{current_path}{_SEP}{key}"
+            if value is None:
+                files_ok.append(full_path)
+            elif value is not False:
+                dirs_ok.append(full_path)
+                if id(value) in open_ids:
+                    continue
+                stack.append((full_path, iter(value.items()), id(value)))
+                open_ids.add(id(value))
+                break
+        else:
+            open_ids.discard(stack.pop()[2])
+    return files_ok, dirs_ok, []
+
+def _relative_name(full_path, rel_start):
+    """Normalized path below the base directory, or None if it escapes the base"""
+    # Empty names leave a doubled separator that is still inside the base
+    name = os.path.normpath(full_path[rel_start:].lstrip(_SEP))
+    if os.path.isabs(name) or name == os.pardir or name.startswith(os.pardir + _SEP):
+        return None
+    return name
+
+def _create_real(entries, dirs, base, zip_buf=None):
+    """Create entries on disk, mirroring them into zip_buf if given"""
+    files_ok = []
+    dirs_ok = []
+    errors = []
+
+    # Create every needed directory once, parents first, so a plain mkdir
+    # suffices instead of makedirs re-checking every ancestor
+    dir_errors = {}
+    for rel in dirs:
+        path = f"{base}{_SEP}{rel}"
+        try:
+            os.mkdir(path)
+        except FileExistsError as e:
+            if not os.path.isdir(path):
+                dir_errors[rel] = e
+        except Exception as e:
+            dir_errors[rel] = e
+
+    # Mirror created entries into an in-memory archive as we go
+    zf = zipfile.ZipFile(zip_buf, 'w', zipfile.ZIP_STORED) if zip_buf is not None else None
+
+    for full_path, is_folder, rel, error in entries:
+        try:
+            if error is not None:
+                raise ValueError(error)
+            if is_folder:
+                if rel in dir_errors:
+                    raise dir_errors[rel]
+                # Names like "" or "." resolve to the base itself, which has no member
+                if zf is not None and rel != os.curdir:
+                    zf.writestr(rel + '/', b'')
+                dirs_ok.append(full_path)
+            else:
+                fd = os.open(f"{base}{_SEP}{rel}", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                os.close(fd)
+                if zf is not None:
+                    zf.writestr(rel, b'')
+                files_ok.append(full_path)
+        except Exception as e:
+            errors.append(f"{full_path}: {e}")
+
+    if zf is not None:
+        zf.close()
+    return files_ok, dirs_ok, errors
+
+def create_structure(structure, base_path, dry_run=False, zip_buf=None):
+    """Create the structure under base_path; returns (files_ok, dirs_ok, errors)"""
+    base = base_path.rstrip(_SEP)
+    if dry_run:
+        return _dry_run(structure, base)
+    entries, dirs = _collect_entries(structure, base)
+    return _create_real(entries, dirs, base, zip_buf)
+
+@st.cache_resource
+def _ensure_default_base():
+    """Create the app workspace directory once per process instead of every rerun"""
+    path = os.path.join(os.getcwd(), "generated_structures")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def _bullet_list(title, items):
+    """Render items as a markdown bullet list under a title"""
+    return f"{title}\n\n" + "\n".join(f"- `{item}`" for item in items)
 
 # -----------------------------
 # UI Layout
 # -----------------------------
-col1, col2 = st.columns([2, 1])
-
-with col1:
-    st.subheader("📝 Input Structure")
-    input_method = st.radio("Choose input method:", ["Paste Text", "Upload File"])
-    structure_text = ""
-    if input_method == "Paste Text":
-        structure_text = st.text_area(
-            "Paste your structure here:",
-            height=300,
-            placeholder="""Example ASCII format:
+# The input method switches which widgets are shown, so it stays outside the
+# form; everything else only reruns the script on submit
+input_method = st.radio("Choose input method:", ["Paste Text", "Upload File"])
+
+with st.form("autostruct_form"):
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.subheader("📝 Input Structure")
+        structure_text = ""
+        if input_method == "Paste Text":
+            structure_text = st.text_area(
+                "Paste your structure here:",
+                height=300,
+                placeholder="""Example ASCII format:
 project/
 ├── app.py
 ├── data/
@@ -147,48 +387,40 @@ project/
 │   └── clean.json
 └── models/
     └── model.pkl"""
-        )
-    else:
-        uploaded_file = st.file_uploader("Upload structure file", type=['txt', 'json', 'yaml', 'yml'])
-        if uploaded_file:
-            structure_text = uploaded_file.read().decode('utf-8')
-            st.text_area("File contents:", value=structure_text, height=200, disabled=True)
+            )
+        else:
+            uploaded_file = st.file_uploader("Upload structure file", type=['txt', 'json', 'yaml', 'yml'])
+            if uploaded_file:
+                structure_text = uploaded_file.getvalue().decode('utf-8')
+                st.text_area("File contents:", value=structure_text, height=200, disabled=True)
 
-with col2:
-    st.subheader("⚙️ Settings")
+    with col2:
+        st.subheader("⚙️ Settings")
 
-    format_type = st.selectbox("Structure format:", ["ASCII", "JSON", "YAML"])
+        format_type = st.selectbox("Structure format:", ["ASCII", "JSON", "YAML"])
 
-    # Use app workspace as base path
-    default_base = os.path.join(os.getcwd(), "generated_structures")
-    os.makedirs(default_base, exist_ok=True)
+        # Use app workspace as base path
+        default_base = _ensure_default_base()
 
-    base_path = st.text_input(
-        "Base directory path:",
-        value=default_base,
-        help="Leave default to create inside app workspace"
-    )
+        base_path = st.text_input(
+            "Base directory path:",
+            value=default_base,
+            help="Leave default to create inside app workspace"
+        )
 
-    dry_run = st.checkbox("🔍 Dry Run (Preview only)", value=False)
-    st.info("💡 Uncheck 'Dry Run' to actually create files and folders")
+        dry_run = st.checkbox("🔍 Dry Run (Preview only)", value=False)
+        st.info("💡 Uncheck 'Dry Run' to actually create files and folders")
 
-    create_button = st.button("🚀 Create Project Structure", type="primary")
+        create_button = st.form_submit_button("🚀 Create Project Structure", type="primary")
 
 # -----------------------------
 # Process the Structure
 # -----------------------------
 if create_button and structure_text:
     with st.spinner("Processing structure..."):
-        parsed_structure = None
-        if format_type == "ASCII":
-            parsed_structure = parse_ascii(structure_text)
-        elif format_type == "JSON":
-            parsed_structure = parse_json(structure_text)
-        elif format_type == "YAML":
-            parsed_structure = parse_yaml(structure_text)
+        parsed_structure, issues = _parse(format_type, structure_text)
 
         if parsed_structure:
-            issues = validate_structure(parsed_structure)
             if issues:
                 st.error("❌ Structure validation failed:")
                 for issue in issues:
@@ -197,7 +429,8 @@ if create_button and structure_text:
                 if not os.path.exists(base_path):
                     st.error(f"❌ Base directory doesn't exist: {base_path}")
                 else:
-                    logs = create_structure(parsed_structure, base_path, dry_run)
+                    zip_buf = None if dry_run else io.BytesIO()
+                    files_ok, dirs_ok, errors = create_structure(parsed_structure, base_path, dry_run, zip_buf)
                     st.success("✅ Structure processed successfully!")
 
                     st.subheader("📋 Results")
@@ -206,26 +439,27 @@ if create_button and structure_text:
                     else:
                         st.info("✅ Files and folders created successfully!")
 
-                    for log in logs:
-                        if "✅" in log:
-                            st.success(log)
-                        elif "📁" in log:
-                            st.info(log)
-                        elif "❌" in log:
-                            st.error(log)
-                        else:
-                            st.write(log)
-
-                    # Create ZIP for download if not dry run
+                    st.success(f"{'[DRY RUN] ' if dry_run else ''}Created {len(files_ok)} files, {len(dirs_ok)} folders")
+
+                    # One placeholder per category, each filled with a single message
+                    dir_ph = st.empty()
+                    ok_ph = st.empty()
+                    err_ph = st.empty()
+                    if dirs_ok:
+                        dir_ph.info(_bullet_list("📁 **Folders**", dirs_ok))
+                    if files_ok:
+                        ok_ph.success(_bullet_list("✅ **Files**", files_ok))
+                    if errors:
+                        err_ph.error(_bullet_list(f"❌ **{len(errors)} errors**", errors))
+
+                    # Offer the ZIP built during creation if not dry run
                     if not dry_run:
-                        zip_path = shutil.make_archive("project_structure", "zip", base_path)
-                        with open(zip_path, "rb") as f:
-                            st.download_button(
-                                "📦 Download Project Structure (ZIP)",
-                                f,
-                                file_name="project_structure.zip",
-                                mime="application/zip"
-                            )
+                        st.download_button(
+                            "📦 Download Project Structure (ZIP)",
+                            zip_buf.getvalue(),
+                            file_name="project_structure.zip",
+                            mime="application/zip"
+                        )
 
 # -----------------------------
 # Instructions